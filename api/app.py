@@ -1,9 +1,11 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from api.routes import health, status, schedule, control
 
 app = FastAPI(
     title="AdhaanLive",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 app.include_router(health.router)
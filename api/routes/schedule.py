@@ -1,12 +1,29 @@
-import json
-from fastapi import APIRouter
+import orjson
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
 from pathlib import Path
 
 router = APIRouter()
 FILE = Path("assets/prayer_times.json")
 
+# Serialized body, rebuilt only when the file's mtime changes
+_cache = {"mtime": None, "body": b""}
+
 @router.get("/schedule")
-def schedule():
-    if not FILE.exists():
+def schedule(request: Request):
+    try:
+        mtime = FILE.stat().st_mtime_ns
+    except FileNotFoundError:
         return {"error": "schedule not loaded"}
-    return json.loads(FILE.read_text())
+
+    etag = f'W/"{mtime}"'
+    headers = {"ETag": etag, "Cache-Control": "max-age=1"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    if mtime != _cache["mtime"]:
+        # Round-trip through orjson so a malformed file still fails loudly here
+        _cache["body"] = orjson.dumps(orjson.loads(FILE.read_bytes()))
+        _cache["mtime"] = mtime
+
+    return Response(content=_cache["body"], media_type="application/json", headers=headers)
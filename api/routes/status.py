@@ -1,4 +1,7 @@
-from fastapi import APIRouter
+import hashlib
+import orjson
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
 from core.globals import detection_active_flag
 from core.playback import PLAYBACK
 from core.runtime_state import state
@@ -6,11 +9,19 @@ from core.runtime_state import state
 router = APIRouter()
 
 @router.get("/status")
-def status():
-    return {
+async def status(request: Request):
+    body = orjson.dumps({
         "detection_active": detection_active_flag.is_set(),
         "playback_active": PLAYBACK.is_alive(),
         "adhaan_active": state.adhaan_active,
         "last_event": state.last_event,
         "last_event_time": state.last_event_time,
-    }
+    })
+
+    # Content tag, not a security hash: blake2b is the cheapest in hashlib
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
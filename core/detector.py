@@ -5,11 +5,14 @@
 import subprocess
 import numpy as np
 import logging
+import math
 import threading
 import time
 import os
+import select
+import shutil
+import sys
 import wave
-from collections import deque
 
 from utils.adhaan_logger import log_event
 from core.playback import PLAYBACK
@@ -26,10 +29,21 @@ _detection_in_progress = threading.Event()
 
 _adhaan_active = False
 _adhaan_lock = threading.Lock()
+_adhaan_changed = threading.Condition(_adhaan_lock)
 
 AUDIO_LOG_DIR = os.path.join("assets", "audio_logs")
 os.makedirs(AUDIO_LOG_DIR, exist_ok=True)
 
+FFMPEG_BIN = shutil.which("ffmpeg") or "ffmpeg"  # absolute path enables posix_spawn
+
+PIPE_SIZE_BYTES = 1 << 20  # default Linux pipe-max-size for unprivileged users
+READ_POLL_SEC = 0.5  # longest a pipe read can go without checking for a stop request
+
+SCALE_SQ = 1.0 / (32768.0 * 32768.0)  # int16 sum of squares -> full-scale power
+
+# Wideband speech rate: plenty for loudness gating and still clear in saved recordings
+DETECT_SAMPLE_RATE = 16000
+
 
 # -------------------------------
 # ADHAAN ACTIVE FLAG
@@ -37,8 +51,9 @@ os.makedirs(AUDIO_LOG_DIR, exist_ok=True)
 
 def mark_adhaan_active(active: bool):
     global _adhaan_active
-    with _adhaan_lock:
+    with _adhaan_changed:
         _adhaan_active = active
+        _adhaan_changed.notify_all()
         logging.info(f"[DETECT] Active={active}")
 
 
@@ -47,24 +62,101 @@ def is_adhaan_active() -> bool:
         return _adhaan_active
 
 
+def wait_adhaan_active(active: bool, timeout: float = None) -> bool:
+    """Block until the Adhaan flag equals `active`; False if `timeout` runs out first."""
+    with _adhaan_changed:
+        return _adhaan_changed.wait_for(lambda: _adhaan_active == active, timeout)
+
+
 # -------------------------------
 # WAV WRITER
 # -------------------------------
 
-def save_wav(path, audio_bytes, sample_rate=44100):
-    with wave.open(path, "wb") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(sample_rate)
-        wf.writeframes(audio_bytes)
+def open_wav(path, sample_rate=DETECT_SAMPLE_RATE):
+    """Open a mono 16-bit WAV for streaming writes; the header is patched on close()."""
+    wf = wave.open(path, "wb")
+    wf.setnchannels(1)
+    wf.setsampwidth(2)
+    wf.setframerate(sample_rate)
+    return wf
+
+
+def _evict_from_cache(path):
+    """Hint the kernel to drop a finished recording from the page cache (POSIX only).
+
+    No sync is forced: pages still dirty are skipped now and become droppable after
+    normal writeback, so this never stalls the caller on the disk.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        logging.debug(f"[DETECT] Cache eviction skipped: {e}")
+
+
+# -------------------------------
+# FFMPEG PIPE
+# -------------------------------
+
+def _grow_pipe(fd: int, size: int = PIPE_SIZE_BYTES):
+    """Enlarge the kernel pipe so FFmpeg output batches up between reads (Linux only)."""
+    if not sys.platform.startswith("linux"):
+        return
+
+    try:
+        import fcntl
+        fcntl.fcntl(fd, getattr(fcntl, "F_SETPIPE_SZ", 1031), size)
+    except OSError as e:
+        logging.debug(f"[DETECT] Pipe resize skipped: {e}")
+
+
+def _level(sumsq: int, samples: int):
+    """(rms, dB) of a frame from its int16 sum of squares; only needed for logging."""
+    rms = math.sqrt(sumsq * SCALE_SQ / samples)
+    return rms, 20 * math.log10(rms + 1e-8)
+
+
+def _read_frame(stream, view) -> int:
+    """Fill `view` from the unbuffered pipe; returns short on EOF or a stop request."""
+    filled = 0
+    while filled < len(view) and not _detection_stop.is_set():
+        # select() only works on sockets on Windows; fall back to a plain blocking read
+        if os.name != "nt":
+            ready, _, _ = select.select([stream], [], [], READ_POLL_SEC)
+            if not ready:
+                continue
+
+        n = stream.readinto(view[filled:])
+        if not n:
+            break
+        filled += n
+    return filled
+
+
+def _aligned_frames(count: int, samples: int, align: int = 64) -> np.ndarray:
+    """(count, samples) int16 frames with every row starting on an `align`-byte boundary."""
+    row_bytes = -(-samples * 2 // align) * align
+    raw = np.empty(count * row_bytes + align, dtype=np.uint8)
+    offset = -raw.ctypes.data % align
+    padded = raw[offset:offset + count * row_bytes].view(np.int16)
+    return padded.reshape(count, row_bytes // 2)[:, :samples]
 
 
 # -------------------------------
 # DETECTION CORE LOOP
 # -------------------------------
 
-def _run_full_detection(stream_url: str, sample_rate: int = 44100):
+def _run_full_detection(stream_url: str, sample_rate: int = DETECT_SAMPLE_RATE):
     total_bytes = 0
+    file_path = None
+    wav = None
+    process = None
 
     try:
         _detection_in_progress.set()
@@ -76,54 +168,62 @@ def _run_full_detection(stream_url: str, sample_rate: int = 44100):
 
         MAX_SILENCE_SEC = 10
         TAIL_SEC = 6
+        PRE_BUFFER_SEC = 5
+
+        # Thresholds as int64 sums of squares over one second, so gating never leaves int
+        trigger_sumsq = int((threshold * 32768) ** 2 * sample_rate)
+        silence_sumsq = int((silence_threshold * 32768) ** 2 * sample_rate)
 
         cmd = [
-            "ffmpeg", "-i", stream_url,
-            "-vn", "-acodec", "pcm_s16le",
+            FFMPEG_BIN, "-nostdin", "-hide_banner", "-loglevel", "error",
+            "-reconnect", "1", "-reconnect_streamed", "1", "-reconnect_delay_max", "5",
+            "-threads", "1", "-i", stream_url,
+            "-map", "0:a:0", "-vn", "-sn", "-dn",
             "-ar", str(sample_rate), "-ac", "1",
-            "-f", "wav", "pipe:1",
+            "-f", "s16le", "pipe:1",
         ]
 
         process = subprocess.Popen(
             cmd,
+            stdin=subprocess.DEVNULL,
             stdout=subprocess.PIPE,
             stderr=subprocess.DEVNULL,
-            bufsize=4096,
+            bufsize=0,  # raw pipe: select() must see exactly what readinto() will
+            close_fds=False,  # std streams are explicit; Python fds are non-inheritable
         )
+        _grow_pipe(process.stdout.fileno())
 
-        pre_buffer = deque(maxlen=5)
-        recording = bytearray()
+        # Fixed ring of one-second frames, read into directly; doubles as the pre-buffer
+        frames = _aligned_frames(PRE_BUFFER_SEC, sample_rate)
+        frame_views = [memoryview(frame).cast("B") for frame in frames]
+        frames_read = 0
 
         adhaan_started = False
         silence_counter = 0
         consecutive_high = 0.0
-        file_path = None
         start_ts = None
-        empty_reads = 0
 
         while not _detection_stop.is_set():
 
-            raw_audio = process.stdout.read(bytes_per_second)
-            if not raw_audio:
-                empty_reads += 1
-                if empty_reads > 10 and process.poll() is not None:
-                    logging.warning("[DETECT] FFmpeg became unresponsive")
-                    break
-                time.sleep(0.1)
-                continue
-            empty_reads = 0
+            slot = frames_read % PRE_BUFFER_SEC
+            n = _read_frame(process.stdout, frame_views[slot])
+            total_bytes += n
 
-            total_bytes += len(raw_audio)
-            pre_buffer.append(raw_audio)
+            # Short reads only happen on stop or at EOF, i.e. FFmpeg has exited
+            if n < bytes_per_second:
+                if not _detection_stop.is_set():
+                    logging.warning(f"[DETECT] FFmpeg stream ended (rc={process.poll()})")
+                break
+            frames_read += 1
 
-            audio_data = np.frombuffer(raw_audio, dtype=np.int16)
-            rms = np.sqrt(np.mean(np.square(audio_data / 32768.0)))
-            db = 20 * np.log10(rms + 1e-8)
+            audio_data = frames[slot]
+            # Exact int64 sum of squares in one pass, no float temporary
+            sumsq = int(np.einsum("i,i->", audio_data, audio_data, dtype=np.int64))
 
             # ---------- START DETECTION ----------
             if not adhaan_started:
 
-                if rms > threshold:
+                if sumsq > trigger_sumsq:
                     consecutive_high += 1
                 else:
                     consecutive_high = max(0.0, consecutive_high - 0.5)
@@ -137,22 +237,25 @@ def _run_full_detection(stream_url: str, sample_rate: int = 44100):
                         f"adhaan_full_{time.strftime('%Y-%m-%d_%H-%M-%S')}.wav"
                     )
 
+                    rms, db = _level(sumsq, sample_rate)
                     logging.info(f"[DETECT] START | rms={rms:.4f}, db={db:.1f}")
                     log_event("start", file_path, rms, db)
                     mark_adhaan_active(True)
 
                     PLAYBACK.start(stream_url)
 
-                    for chunk in pre_buffer:
-                        recording.extend(chunk)
+                    # Recording streams to disk from here on, starting with the pre-buffer
+                    wav = open_wav(file_path, sample_rate)
+                    for i in range(max(0, frames_read - PRE_BUFFER_SEC), frames_read):
+                        wav.writeframesraw(frame_views[i % PRE_BUFFER_SEC])
 
                     continue
 
             # ---------- RECORDING IN PROGRESS ----------
             else:
-                recording.extend(raw_audio)
+                wav.writeframesraw(frame_views[slot])
 
-                if rms < silence_threshold:
+                if sumsq < silence_sumsq:
                     silence_counter += 1
                 else:
                     silence_counter = 0
@@ -165,35 +268,49 @@ def _run_full_detection(stream_url: str, sample_rate: int = 44100):
                 if silence_counter >= MAX_SILENCE_SEC:
                     logging.info(f"[DETECT] Silence detected ({silence_counter}s)")
 
+                    tail_view = frame_views[0]
                     for _ in range(TAIL_SEC):
-                        tail = process.stdout.read(bytes_per_second)
-                        if not tail:
+                        n = _read_frame(process.stdout, tail_view)
+                        wav.writeframesraw(tail_view[:n])
+                        if n < len(tail_view):
                             break
-                        recording.extend(tail)
 
-                    save_wav(file_path, recording, sample_rate)
-                    duration = len(recording) / bytes_per_second
+                    duration = wav.tell() / sample_rate
+                    wav.close()
 
+                    rms, db = _level(sumsq, sample_rate)
                     log_event("end", file_path, rms, db)
                     logging.info(f"[DETECT] END | duration={duration:.1f}s")
 
                     mark_adhaan_active(False)
+                    _evict_from_cache(file_path)
 
-                    time.sleep(8)
+                    # Grace period so playback catches the end of the Adhaan; the scheduler
+                    # waits for this thread, so only an explicit stop cuts it short
+                    _detection_stop.wait(8)
                     PLAYBACK.stop()
 
                     break
 
-        process.terminate()
-
     except Exception as e:
         logging.error(f"[ERROR] Detection failure: {e}", exc_info=True)
 
     finally:
-        total_mb = total_bytes / 1e6
-        log_event("data_usage", file_path or "N/A", data_mb=total_mb)
+        # Release the scheduler first, so nothing below can leave it stuck on this thread
         _detection_in_progress.clear()
         mark_adhaan_active(False)
+
+        if process is not None and process.poll() is None:
+            process.terminate()
+
+        if wav is not None:
+            try:
+                wav.close()  # no-op if already closed; keeps a partial recording playable
+            except Exception as e:
+                logging.error(f"[DETECT] Failed to close recording: {e}")
+
+        total_mb = total_bytes / 1e6
+        log_event("data_usage", file_path or "N/A", data_mb=total_mb)
         logging.info("[DETECT] Detection thread stopped")
 
 
@@ -221,6 +338,16 @@ def start_audio_detection(stream_url: str):
     logging.info("[DETECT] Thread started")
 
 
+def wait_audio_detection(timeout: float = None) -> bool:
+    """Block until the current detection thread has finished; False if `timeout` runs out."""
+    thread = _detection_thread
+    if thread is None:
+        return True
+
+    thread.join(timeout)
+    return not thread.is_alive()
+
+
 def stop_audio_detection():
     global _detection_thread
 
@@ -1,15 +1,15 @@
 """
-Playback manager using ffplay with lifecycle, retries, and smooth fade-out stop.
+Playback manager using ffplay with lifecycle, retries, and prompt stop.
 
 Enhancements:
 - Uses stable playback args that work reliably.
-- Adds optional fade-out when stopping playback.
+- Stops by terminating ffplay directly; nothing waits on a fade-out.
 """
 
 from __future__ import annotations
+import shutil
 import subprocess
 import threading
-import time
 import logging
 from typing import Optional
 
@@ -22,20 +22,25 @@ class PlaybackManager:
             max_retries: int = 3,
             retry_delay_sec: float = 5.0,
     ):
-        self.ffplay_path = ffplay_path
+        # Absolute path lets Popen take its posix_spawn fast path
+        self.ffplay_path = shutil.which(ffplay_path) or ffplay_path
 
         self.base_args = base_args or [
+            "-hide_banner",
             "-loglevel", "error",
             "-autoexit",
             "-vn",
             "-nodisp"
         ]
 
+        # Everything but the URL is fixed for the manager's lifetime
+        self._argv_prefix = [self.ffplay_path, *self.base_args, "-i"]
+
         self.max_retries = max_retries
         self.retry_delay_sec = retry_delay_sec
 
         self._proc: Optional[subprocess.Popen] = None
-        self._lock = threading.RLock()
+        self._lock = threading.Lock()
         self._runner_thread: Optional[threading.Thread] = None
         self._stop_flag = threading.Event()
         self._current_url: Optional[str] = None
@@ -49,29 +54,35 @@ class PlaybackManager:
                 logging.debug("Playback already active on same URL; skipping start.")
                 return
 
-            if self._proc and self._proc.poll() is None and self._current_url != url:
+            if self._proc and self._proc.poll() is None:
                 logging.info("Stopping playback to switch URL...")
-                self._stop_proc_locked()
 
+            self._stop_flag.set()
+            proc, self._proc = self._proc, None
+            runner = self._runner_thread
+
+        # Outside the lock: the old runner takes it on its way out
+        self._terminate(proc)
+        if runner and runner.is_alive():
+            runner.join(timeout=2)
+
+        with self._lock:
             self._stop_flag.clear()
             self._current_url = url
             self._retries = 0
 
-            if self._runner_thread and self._runner_thread.is_alive():
-                self._stop_flag.set()
-                self._runner_thread.join(timeout=2)
-
             self._runner_thread = threading.Thread(
                 target=self._run_loop, name="PlaybackRunner", daemon=True
             )
             self._runner_thread.start()
-            logging.info("ffplay-based playback started in background.")
+        logging.info("ffplay-based playback started in background.")
 
     def stop(self) -> None:
         """Stop playback cleanly."""
         with self._lock:
             self._stop_flag.set()
-            self._stop_proc_locked()
+            proc, self._proc = self._proc, None
+        self._terminate(proc)
 
         if self._runner_thread and self._runner_thread.is_alive():
             self._runner_thread.join(timeout=5)
@@ -84,7 +95,8 @@ class PlaybackManager:
             if url is not None and url != self._current_url:
                 self._current_url = url
             self._stop_flag.set()
-            self._stop_proc_locked()
+            proc, self._proc = self._proc, None
+        self._terminate(proc)
 
         if self._runner_thread and self._runner_thread.is_alive():
             self._runner_thread.join(timeout=5)
@@ -98,8 +110,9 @@ class PlaybackManager:
         logging.info("ffplay-based playback restarted in background.")
 
     def is_alive(self) -> bool:
-        with self._lock:
-            return bool(self._proc and self._proc.poll() is None)
+        # Lock-free snapshot: /status calls this from the event loop
+        proc = self._proc
+        return bool(proc and proc.poll() is None)
 
     def current_url(self) -> Optional[str]:
         with self._lock:
@@ -111,41 +124,41 @@ class PlaybackManager:
             url = self.current_url()
             if not url:
                 logging.warning("[PLAY] No URL set for playback; waiting...")
-                time.sleep(1.0)
+                self._stop_flag.wait(1.0)
                 continue
 
-            args = [self.ffplay_path, *self.base_args, "-i", url]
+            args = [*self._argv_prefix, url]
+            proc = None
 
             try:
-                with self._lock:
-                    logging.info(f"[PLAY] Starting playback | url={url}")
-
-                    # === THE IMPORTANT CHANGE ===
-                    self._proc = subprocess.Popen(
-                        args,
-                        stdout=subprocess.DEVNULL,
-                        stderr=subprocess.DEVNULL,
-                    )
+                logging.info(f"[PLAY] Starting playback | url={url}")
+
+                # === THE IMPORTANT CHANGE ===
+                # fork/exec happens outside the lock so control calls never wait on it
+                proc = subprocess.Popen(
+                    args,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    close_fds=False,  # std streams are explicit; Python fds are non-inheritable
+                )
 
-                while not self._stop_flag.is_set():
-                    with self._lock:
-                        proc = self._proc
-
-                    if not proc:
+                with self._lock:
+                    # stop() sets the flag under this lock; if it got in first,
+                    # this spawn is ours to kill
+                    if self._stop_flag.is_set():
                         break
+                    self._proc = proc
 
-                    rc = proc.poll()
-                    if rc is None:
-                        time.sleep(0.5)
-                        continue
+                # Block until ffplay exits; stop() terminates it, so this also wakes on stop
+                rc = proc.wait()
 
+                if not self._stop_flag.is_set():
                     if rc == 0:
                         logging.info("[PLAY] ffplay exited normally")
                     else:
                         logging.warning("[PLAY] ffplay exited unexpectedly")
 
-                    break
-
             except FileNotFoundError:
                 logging.error("[PLAY] ffplay not found — install FFmpeg.")
                 break
@@ -153,8 +166,8 @@ class PlaybackManager:
             except Exception as e:
                 logging.error(f"[PLAY] Launch error: {e}", exc_info=True)
 
-            with self._lock:
-                self._stop_proc_locked()
+            finally:
+                self._release(proc)
 
             if self._stop_flag.is_set():
                 break
@@ -168,25 +181,33 @@ class PlaybackManager:
                 f"[PLAY] Retrying in {self.retry_delay_sec}s "
                 f"(attempt {self._retries}/{self.max_retries})..."
             )
-            time.sleep(self.retry_delay_sec)
+            self._stop_flag.wait(self.retry_delay_sec)
 
-        with self._lock:
-            self._stop_proc_locked()
+    def _release(self, proc: Optional[subprocess.Popen]) -> None:
+        """Forget `proc` if it is still the current process, then make sure it is gone."""
+        if proc is None:
+            return
 
-    def _stop_proc_locked(self) -> None:
-        """Terminate ffplay cleanly."""
-        if self._proc:
-            try:
-                if self._proc.poll() is None:
-                    self._proc.terminate()
-                    try:
-                        self._proc.wait(timeout=2)
-                    except subprocess.TimeoutExpired:
-                        self._proc.kill()
-            except Exception:
-                pass
-            finally:
+        with self._lock:
+            if self._proc is proc:
                 self._proc = None
+        self._terminate(proc)
+
+    @staticmethod
+    def _terminate(proc: Optional[subprocess.Popen]) -> None:
+        """Terminate ffplay cleanly. Called without the lock held."""
+        if not proc:
+            return
+
+        try:
+            if proc.poll() is None:
+                proc.terminate()
+                try:
+                    proc.wait(timeout=2)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+        except Exception:
+            pass
 
 
 PLAYBACK = PlaybackManager()
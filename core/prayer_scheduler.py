@@ -8,7 +8,8 @@ import os
 from core.detector import (
     start_audio_detection,
     stop_audio_detection,
-    is_adhaan_active,
+    wait_adhaan_active,
+    wait_audio_detection,
 )
 from core.playback import PLAYBACK
 from utils.adhaan_logger import log_event
@@ -17,7 +18,9 @@ PRAYER_JSON_PATH = os.path.join("assets", "prayer_times.json")
 
 WAKE_MINUTES_BEFORE = 10
 TIMEOUT_MINUTES = 90
-POST_CYCLE_COOLDOWN = 60
+ERROR_BACKOFF_SEC = 60
+DETECTION_DRAIN_SEC = 30  # detector's post-Adhaan playback grace, with headroom
+MAX_SLEEP_STEP_SEC = 15 * 60  # re-check the wall clock so NTP steps can't skew triggers
 
 
 def load_prayer_times():
@@ -33,29 +36,65 @@ def load_prayer_times():
         return {}
 
 
-def get_next_prayer(prayers: dict):
-    now = datetime.now()
-    today = now.date()
-    upcoming = []
+_schedule_cache = {"mtime": None, "schedule": []}
+
 
+def _parse_schedule(prayers: dict) -> list:
+    """Parse {"name": "HH:MM:SS"} into a time-sorted list of (time, name)."""
+    schedule = []
     for name, t_str in prayers.items():
         try:
-            t = datetime.strptime(t_str, "%H:%M:%S").time()
-            dt = datetime.combine(today, t)
-            if dt > now:
-                upcoming.append((name, dt))
-        except:
+            schedule.append((datetime.strptime(t_str, "%H:%M:%S").time(), name))
+        except (TypeError, ValueError):
             continue
 
-    if upcoming:
-        return sorted(upcoming, key=lambda x: x[1])[0]
+    schedule.sort()
+    return schedule
 
-    # fallback = next day Fajr
+
+def load_prayer_schedule() -> list:
+    """Sorted (time, name) schedule, re-parsed only when prayer_times.json changes."""
     try:
-        fajr_t = datetime.strptime(prayers["Fajr"], "%H:%M:%S").time()
-        return "Fajr", datetime.combine(today + timedelta(days=1), fajr_t)
-    except:
-        return "Unknown", now + timedelta(hours=6)
+        mtime = os.stat(PRAYER_JSON_PATH).st_mtime_ns
+    except OSError:
+        logging.warning("[SCHED] prayer_times.json missing")
+        return []
+
+    if mtime != _schedule_cache["mtime"]:
+        schedule = _parse_schedule(load_prayer_times())
+        if not schedule:
+            return []
+
+        _schedule_cache["schedule"] = schedule
+        _schedule_cache["mtime"] = mtime
+
+    return _schedule_cache["schedule"]
+
+
+def get_next_prayer(schedule: list):
+    now = datetime.now()
+    today = now.date()
+
+    for t, name in schedule:
+        dt = datetime.combine(today, t)
+        if dt > now:
+            return name, dt
+
+    # fallback = next day's first prayer (Fajr)
+    if schedule:
+        t, name = schedule[0]
+        return name, datetime.combine(today + timedelta(days=1), t)
+
+    return "Unknown", now + timedelta(hours=6)
+
+
+def _sleep_until(when: datetime):
+    """Sleep until the wall-clock time `when`, re-checking it at least every MAX_SLEEP_STEP_SEC."""
+    while True:
+        remaining = (when - datetime.now()).total_seconds()
+        if remaining <= 0:
+            return
+        time.sleep(min(remaining, MAX_SLEEP_STEP_SEC))
 
 
 def prayer_scheduler_loop(get_stream_url_fn, detection_flag):
@@ -63,23 +102,20 @@ def prayer_scheduler_loop(get_stream_url_fn, detection_flag):
 
     while True:
         try:
-            prayers = load_prayer_times()
-            if not prayers:
+            schedule = load_prayer_schedule()
+            if not schedule:
                 logging.info("[SCHED] Waiting for prayer_times.json...")
                 time.sleep(300)
                 continue
 
-            name, time_dt = get_next_prayer(prayers)
+            name, time_dt = get_next_prayer(schedule)
             wake_dt = time_dt - timedelta(minutes=WAKE_MINUTES_BEFORE)
 
-            now = datetime.now()
-            sleep_sec = max(0, (wake_dt - now).total_seconds())
-
             logging.info(f"[SCHED] Next={name} at {time_dt.time()} | waking at {wake_dt.time()}")
             log_event("sleep", "", 0, 0)
             detection_flag.clear()
 
-            time.sleep(sleep_sec)
+            _sleep_until(wake_dt)
 
             stream_url = get_stream_url_fn()
             if not stream_url:
@@ -91,9 +127,7 @@ def prayer_scheduler_loop(get_stream_url_fn, detection_flag):
             log_event("wake", "", 0, 0)
 
             # Wait until actual prayer time
-            until_prayer = (time_dt - datetime.now()).total_seconds()
-            if until_prayer > 0:
-                time.sleep(until_prayer)
+            _sleep_until(time_dt)
 
             # Start detection
             logging.info(f"[SCHED] Starting detection for {name}")
@@ -101,24 +135,24 @@ def prayer_scheduler_loop(get_stream_url_fn, detection_flag):
             detection_flag.set()
 
             timeout_dt = time_dt + timedelta(minutes=TIMEOUT_MINUTES)
+            timeout_sec = max(0, (timeout_dt - datetime.now()).total_seconds())
 
-            while datetime.now() < timeout_dt:
-                if is_adhaan_active():
-                    logging.info(f"[SCHED] Adhaan detected for {name}")
-                    break
-                time.sleep(5)
-
-            if not is_adhaan_active():
+            if wait_adhaan_active(True, timeout=timeout_sec):
+                logging.info(f"[SCHED] Adhaan detected for {name}")
+            else:
                 logging.warning(f"[SCHED] No Adhaan detected for {name}")
                 log_event("no_adhaan", "", 0, 0)
                 stop_audio_detection()
                 detection_flag.clear()
 
-            while is_adhaan_active():
-                time.sleep(3)
+            wait_adhaan_active(False)
+            # Let the detector finish its playback grace before the cleanup below stops it
+            wait_audio_detection(timeout=DETECTION_DRAIN_SEC)
+            logging.info(f"[SCHED] {name} cycle complete")
 
         except Exception as e:
             logging.error(f"[ERROR] Scheduler failure: {e}", exc_info=True)
+            time.sleep(ERROR_BACKOFF_SEC)
 
         finally:
             stop_audio_detection()
@@ -126,9 +160,6 @@ def prayer_scheduler_loop(get_stream_url_fn, detection_flag):
 
             PLAYBACK.stop()
 
-            logging.info(f"[SCHED] {name} cycle complete")
-            time.sleep(POST_CYCLE_COOLDOWN)
-
 
 def start_prayer_scheduler(get_stream_url_fn, detection_flag):
     t = threading.Thread(
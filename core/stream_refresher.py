@@ -5,7 +5,7 @@ import json
 import time
 import logging
 import os
-import urllib
+import urllib.parse
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -31,25 +31,54 @@ def decode_expiry_from_token(token_url: str) -> Optional[int]:
         return None
 
 
+def _expiry_for(url: str) -> datetime:
+    """UTC expiry of the URL's token, or the assumed 2h validity if it can't be read."""
+    exp = decode_expiry_from_token(url) if url else None
+    if exp:
+        return datetime.utcfromtimestamp(exp)
+    return datetime.utcnow() + timedelta(hours=2)
+
+
 # ------------------------------------------------------
 # Cache helpers
 # ------------------------------------------------------
+_url_cache = {"key": None, "url": ""}
+
+
 def read_cached_url():
+    """Cached stream URL, re-read from disk only when the file's mtime or size changes."""
     try:
-        if os.path.exists(CACHE_PATH):
+        st = os.stat(CACHE_PATH)
+    except OSError:
+        return ""
+
+    key = (st.st_mtime_ns, st.st_size)
+    if key != _url_cache["key"]:
+        try:
             with open(CACHE_PATH, "r") as f:
-                return f.read().strip()
-    except Exception:
-        pass
-    return ""
+                url = f.read().strip()
+        except Exception:
+            return ""
+
+        # Never pin an empty read; the next call simply tries again
+        if not url:
+            return ""
+
+        _url_cache["url"] = url
+        _url_cache["key"] = key
+
+    return _url_cache["url"]
 
 
 def _write_cached_url(url: str):
     """Persist HLS URL to disk."""
     try:
         os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
-        with open(CACHE_PATH, "w") as f:
+        # Write-then-rename so readers only ever see the old or the new URL
+        tmp_path = CACHE_PATH + ".tmp"
+        with open(tmp_path, "w") as f:
             f.write(url)
+        os.replace(tmp_path, CACHE_PATH)
         logging.info(f"[REFRESH] Updated cached stream URL")
     except Exception as e:
         logging.error(f"[REFRESH] Failed to write stream URL: {e}")
@@ -71,7 +100,7 @@ def smart_refresh_loop(get_new_url_func):
     logging.info("[REFRESH] Stream refresher started")
 
     cached_url = read_cached_url()
-    expiry_time = None
+    expiry_time = _expiry_for(cached_url) if cached_url else None
     next_url = None
     prefetch_done = False
 
@@ -85,7 +114,7 @@ def smart_refresh_loop(get_new_url_func):
 
             _write_cached_url(new_url)
             cached_url = new_url
-            expiry_time = datetime.utcnow() + timedelta(hours=2)
+            expiry_time = _expiry_for(new_url)
             logging.info("[REFRESH] Initial URL fetched")
         except Exception as e:
             logging.error(f"[REFRESH] Failed to fetch initial URL: {e}")
@@ -99,9 +128,9 @@ def smart_refresh_loop(get_new_url_func):
         try:
             now = datetime.utcnow()
 
-            # If no expiry known, assume 2 hours validity
+            # If no expiry known, read it from the token (or assume 2 hours)
             if not expiry_time:
-                expiry_time = now + timedelta(hours=2)
+                expiry_time = _expiry_for(cached_url)
 
             time_left = (expiry_time - now).total_seconds()
 
@@ -128,7 +157,7 @@ def smart_refresh_loop(get_new_url_func):
                     logging.info("[REFRESH] Activating new token (idle)")
                     _write_cached_url(next_url)
                     cached_url = next_url
-                    expiry_time = now + timedelta(hours=2)
+                    expiry_time = _expiry_for(next_url)
                     next_url = None
                     prefetch_done = False
 
@@ -137,7 +166,7 @@ def smart_refresh_loop(get_new_url_func):
                     logging.warning("[REFRESH] Forced token swap (near expiry)")
                     _write_cached_url(next_url)
                     cached_url = next_url
-                    expiry_time = now + timedelta(hours=2)
+                    expiry_time = _expiry_for(next_url)
                     next_url = None
                     prefetch_done = False
 
@@ -150,7 +179,7 @@ def smart_refresh_loop(get_new_url_func):
                     new_url = get_new_url_func()
                     _write_cached_url(new_url)
                     cached_url = new_url
-                    expiry_time = now + timedelta(hours=2)
+                    expiry_time = _expiry_for(new_url)
                 except Exception as e:
                     logging.error(f"[REFRESH] Emergency refresh failed: {e}")
 
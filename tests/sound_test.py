@@ -1,7 +1,6 @@
 import subprocess
+import math
 import numpy as np
-import tempfile
-import time
 import logging
 
 # Setup logging
@@ -15,73 +14,82 @@ LIVESTREAM_URL = "https://iaccplano.click2stream.com/"
 
 # Sensitivity threshold — lower = more sensitive
 THRESHOLD = 0.05
-SAMPLE_RATE = 44100
+SAMPLE_RATE = 16000  # same as core.detector.DETECT_SAMPLE_RATE
+BYTES_PER_SECOND = SAMPLE_RATE * 2  # 16-bit PCM mono
+SCALE_SQ = 1.0 / (32768.0 * 32768.0)  # int16 sum of squares -> full-scale power
+
+# Same rule as the detector's start gate: one-second RMS above THRESHOLD,
+# compared as an int sum of squares
+SUMSQ_THRESHOLD = int((THRESHOLD * 32768) ** 2 * SAMPLE_RATE)
+
+
+def _read_frame(stream, view) -> int:
+    """Fill `view` from the unbuffered FFmpeg pipe; returns short only at EOF."""
+    filled = 0
+    while filled < len(view):
+        n = stream.readinto(view[filled:])
+        if not n:
+            break
+        filled += n
+    return filled
 
 
 def test_audio_detection():
     """Continuously listens to livestream audio and logs loud activity."""
     logging.info("🎧 Starting audio detection test...")
-    temp_audio = tempfile.TemporaryFile()
 
     process = subprocess.Popen(
         [
             "ffmpeg",
+            "-nostdin", "-hide_banner", "-loglevel", "error",
+            "-reconnect", "1", "-reconnect_streamed", "1", "-reconnect_delay_max", "5",
+            "-threads", "1",
             "-i", LIVESTREAM_URL,
-            "-vn",
-            "-acodec", "pcm_s16le",
+            "-map", "0:a:0",
+            "-vn", "-sn", "-dn",
             "-ar", str(SAMPLE_RATE),
             "-ac", "1",
-            "-f", "wav",
+            "-f", "s16le",
             "-fflags", "nobuffer",
             "-flags", "low_delay",
             "-flush_packets", "1",
             "pipe:1"
         ],
-        stdout=temp_audio,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
         stderr=subprocess.DEVNULL,
-        bufsize=4096
+        bufsize=0
     )
 
-    audio_buffer = bytearray()
+    # One reusable frame, filled in place each second
+    audio_data = np.empty(SAMPLE_RATE, dtype=np.int16)
+    frame = memoryview(audio_data).cast("B")
+
     detected_once = False
 
     try:
         while True:
-            if process.poll() is not None:
+            if _read_frame(process.stdout, frame) < BYTES_PER_SECOND:
                 logging.warning("⚠️ FFmpeg process exited unexpectedly.")
                 break
 
-            temp_audio.seek(0)
-            raw_audio = temp_audio.read(4096)
-            temp_audio.truncate(0)
-
-            if not raw_audio:
-                continue
-
-            audio_buffer.extend(raw_audio)
-            bytes_per_second = SAMPLE_RATE * 2 // 2  # 16-bit PCM mono
-
-            if len(audio_buffer) >= bytes_per_second:
-                audio_chunk = audio_buffer[:bytes_per_second]
-                del audio_buffer[:bytes_per_second]
-                audio_data = np.frombuffer(audio_chunk, dtype=np.int16)
+            # int64 accumulation: a full-scale second overflows int32
+            sumsq = int(np.einsum("i,i->", audio_data, audio_data, dtype=np.int64))
+            volume = math.sqrt(sumsq * SCALE_SQ / SAMPLE_RATE)  # display only
 
-                volume = np.max(np.abs(audio_data)) / 32768.0
-                if volume > THRESHOLD:
-                    if not detected_once:
-                        logging.info(f"🔊 Loud audio detected! Volume={volume:.2f}")
-                        detected_once = True
-                    else:
-                        logging.debug(f"Audio active, volume={volume:.2f}")
+            if sumsq > SUMSQ_THRESHOLD:
+                if not detected_once:
+                    logging.info(f"🔊 Loud audio detected! Volume={volume:.2f}")
+                    detected_once = True
                 else:
-                    logging.debug(f"Silent frame, volume={volume:.2f}")
-            time.sleep(0.1)
+                    logging.debug("Audio active, volume=%.2f", volume)
+            else:
+                logging.debug("Silent frame, volume=%.2f", volume)
 
     except KeyboardInterrupt:
         logging.info("🛑 Detection test stopped manually.")
     finally:
         process.terminate()
-        temp_audio.close()
 
 
 if __name__ == "__main__":
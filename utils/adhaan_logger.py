@@ -2,8 +2,10 @@
 Adhaan event logger — CSV based.
 """
 
+import atexit
 import csv
 import os
+import queue
 import threading
 import logging
 from datetime import datetime
@@ -15,6 +17,11 @@ LOG_PATH = BASE_DIR.parent / "assets" / "adhaan_log.csv"
 _log_lock = threading.Lock()
 _last_start_time = None
 
+# Rows are appended by a background writer so callers never block on disk
+_row_queue = queue.SimpleQueue()
+_writer_thread = None
+_writer_closed = False  # set at exit; later rows are written inline
+
 
 def _ensure_file_exists():
     """Ensure CSV file exists with header."""
@@ -34,14 +41,65 @@ def _ensure_file_exists():
         logging.info(f"[LOG] Created adhaan_log.csv")
 
 
+def _write_rows(rows):
+    try:
+        _ensure_file_exists()
+        with open(LOG_PATH, "a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(rows)
+    except Exception as e:
+        logging.error(f"[LOG] Failed to write adhaan_log.csv: {e}")
+
+
+def _writer_loop():
+    """Append queued rows to the CSV, batching whatever has piled up; None ends it."""
+    while True:
+        rows = [_row_queue.get()]
+        while not _row_queue.empty():
+            rows.append(_row_queue.get_nowait())
+
+        done = None in rows
+        _write_rows([row for row in rows if row is not None])
+        if done:
+            return
+
+
+def _flush_at_exit():
+    """Write out everything still queued before the interpreter goes away."""
+    global _writer_closed
+    with _log_lock:
+        _writer_closed = True
+        writer = _writer_thread
+    if writer is not None:
+        _row_queue.put(None)
+        writer.join(timeout=5)
+
+
+atexit.register(_flush_at_exit)
+
+
+def _enqueue_row(row):
+    """Hand `row` to the writer thread, or write it inline once that has shut down."""
+    global _writer_thread
+    with _log_lock:
+        if not _writer_closed:
+            if _writer_thread is None:
+                _writer_thread = threading.Thread(
+                    target=_writer_loop, name="AdhaanLogWriter", daemon=True
+                )
+                _writer_thread.start()
+            _row_queue.put(row)
+            return
+
+        _write_rows([row])
+
+
 def log_event(event_type: str,
               snippet_path: str = None,
               rms: float = None,
               db: float = None,
               data_mb: float = None):
-    """Append event row to CSV."""
+    """Queue an event row for the CSV."""
     global _last_start_time
-    _ensure_file_exists()
 
     timestamp = datetime.now()
     duration = None
@@ -55,19 +113,16 @@ def log_event(event_type: str,
 
     snippet_rel = os.path.basename(snippet_path) if snippet_path else ""
 
-    # --- Write CSV ---
-    with _log_lock:
-        with open(LOG_PATH, "a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-                event_type,
-                snippet_rel,
-                f"{rms:.6f}" if rms is not None else "",
-                f"{db:.2f}" if db is not None else "",
-                f"{duration:.1f}" if duration is not None else "",
-                f"{data_mb:.2f}" if data_mb is not None else "",
-            ])
+    # --- Queue CSV row (timestamp is taken now, not when it hits disk) ---
+    _enqueue_row([
+        timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+        event_type,
+        snippet_rel,
+        f"{rms:.6f}" if rms is not None else "",
+        f"{db:.2f}" if db is not None else "",
+        f"{duration:.1f}" if duration is not None else "",
+        f"{data_mb:.2f}" if data_mb is not None else "",
+    ])
 
     # --- Console logs (clean) ---
     if event_type == "start":
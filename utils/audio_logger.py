@@ -3,7 +3,6 @@ import os
 import datetime
 import subprocess
 import numpy as np
-import soundfile as sf
 import logging
 
 ASSETS_DIR = os.path.join(os.getcwd(), "assets", "audio_logs")
@@ -18,13 +17,18 @@ def record_audio_snippet(stream_url: str, duration: int = 10) -> str:
 
     try:
         cmd = [
-            "ffmpeg", "-y", "-i", stream_url,
+            "ffmpeg", "-nostdin", "-hide_banner", "-y", "-i", stream_url,
             "-t", str(duration),
             "-vn", "-acodec", "pcm_s16le",
             "-ar", "44100", "-ac", "1",
             output_path
         ]
-        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        subprocess.run(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
         logging.info(f"[AUDIO] Saved snippet → {filename}")
     except Exception as e:
         logging.error(f"[AUDIO] Failed to record snippet: {e}")
@@ -36,6 +40,8 @@ def record_audio_snippet(stream_url: str, duration: int = 10) -> str:
 def compute_audio_metrics(file_path: str) -> dict:
     """Compute RMS, peak, and dB from WAV file."""
     try:
+        import soundfile as sf  # libsndfile is only needed for offline metrics
+
         data, samplerate = sf.read(file_path)
         rms = float(np.sqrt(np.mean(np.square(data))))
         peak = float(np.max(np.abs(data)))
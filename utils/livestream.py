@@ -1,12 +1,6 @@
 import time
 import logging
 from typing import Optional
-from seleniumwire import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 
 
 # ======================================================
@@ -33,6 +27,13 @@ logging.getLogger("selenium.webdriver.remote.remote_connection").setLevel(loggin
 # ======================================================
 def get_m3u8_url(page_url: str) -> Optional[str]:
     """Extract .m3u8 URL with zero noisy logs."""
+    # Selenium is only loaded when a token is actually fetched, not on import
+    from seleniumwire import webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.action_chains import ActionChains
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.chrome.options import Options
 
     chrome_options = Options()
     chrome_options.add_argument("--headless=new")
@@ -137,6 +138,10 @@ def unmute_video(livestream_url: str, auto_unmute: bool = True, wait_time: int =
         return
 
     from seleniumwire import webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.action_chains import ActionChains
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
     from selenium.webdriver.chrome.options import Options
 
     options = Options()
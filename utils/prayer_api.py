@@ -4,6 +4,9 @@ import requests
 import logging
 from datetime import datetime
 
+# Ordered; Aladhan also returns Sunrise, Imsak, Midnight, etc. which we ignore
+REQUIRED_PRAYERS = ("Fajr", "Dhuhr", "Asr", "Maghrib", "Isha")
+
 
 def get_prayer_times(city: str, country: str, method: int) -> dict:
     """Fetch daily prayer times from Aladhan API."""
@@ -17,14 +20,12 @@ def get_prayer_times(city: str, country: str, method: int) -> dict:
     try:
         response = requests.get(api_url, timeout=10)
         response.raise_for_status()
-        data = response.json()
-
-        salah = ["Fajr", "Dhuhr", "Asr", "Maghrib", "Isha"]
+        timings = response.json()["data"]["timings"]
 
         times = {
-            name: datetime.strptime(time_str, "%H:%M").time()
-            for name, time_str in data["data"]["timings"].items()
-            if name in salah
+            name: datetime.strptime(timings[name], "%H:%M").time()
+            for name in REQUIRED_PRAYERS
+            if name in timings
         }
 
         return times